@@ -1,8 +1,21 @@
+import logging
 import sounddevice as sd
 import numpy as np
-from scipy.io.wavfile import write
+import threading
 import time
-from typing import Optional
+import io
+import wave
+from concurrent.futures import Future
+from typing import Iterator, Optional
+
+
+log = logging.getLogger("interview_agent.audio")
+
+
+# PortAudio stream opens are not documented as thread-safe; the microphone
+# is prewarmed on its own thread while speech playback opens its output
+# stream on the TTS loop, so both take this lock around opening a stream.
+PORTAUDIO_LOCK = threading.Lock()
 
 
 class AudioRecorder:
@@ -23,69 +36,213 @@ class AudioRecorder:
         self.max_duration = max_duration
         self.channels = 1
         
-    def record_audio(self, output_file: str) -> bool:
+        self._threshold_squared = silence_threshold ** 2
+        self._stop = threading.Event()
+        self._silence_samples = 0
+        self._capacity = int(max_duration * sample_rate)
+        self._buffer = np.empty(self._capacity, dtype=np.float32)
+        self._pcm = np.empty(self._capacity, dtype=np.int16)
+        self._write_index = 0
+        
+    def _callback(self, indata, frames, time_info, status):
+        """
+        Audio stream callback: store the block and track trailing silence.
+        
+        Signals the recording loop to stop once silence_duration seconds of
+        consecutive blocks fall below the RMS threshold, or once the
+        preallocated buffer is full.
+        """
+        if status:
+            log.warning(f"Status: {status}")
+        
+        start = self._write_index
+        end = min(start + frames, self._capacity)
+        self._buffer[start:end] = indata[:end - start, 0]
+        self._write_index = end
+        if end == self._capacity:
+            self._stop.set()
+        
+        samples = indata.ravel()
+        mean_square = float(np.dot(samples, samples)) / samples.size
+        
+        if mean_square < self._threshold_squared:
+            self._silence_samples += frames
+            if self._silence_samples >= self.silence_duration * self.sample_rate:
+                self._stop.set()
+        else:
+            self._silence_samples = 0
+        
+    def _open_stream(self) -> sd.InputStream:
+        """Open (but do not start) a microphone input stream."""
+        with PORTAUDIO_LOCK:
+            return sd.InputStream(samplerate=self.sample_rate, 
+                                  channels=self.channels, 
+                                  callback=self._callback,
+                                  dtype='float32')
+    
+    def prewarm(self) -> Future:
+        """
+        Open the microphone stream on a background thread ahead of recording.
+        
+        Device open latency is then hidden behind whatever the caller does
+        next (e.g. speaking the question). Pass the returned handle to
+        record_audio or stream_frames.
+        
+        Returns:
+            Future resolving to the opened, not yet started, input stream
+        """
+        future = Future()
+        
+        def open_stream():
+            try:
+                future.set_result(self._open_stream())
+            except Exception as e:
+                future.set_exception(e)
+        
+        threading.Thread(target=open_stream, daemon=True).start()
+        return future
+    
+    def _acquire_stream(self, prewarmed: Optional[Future] = None) -> sd.InputStream:
+        """
+        Get the prewarmed input stream, opening a new one if prewarming failed.
+        
+        Args:
+            prewarmed: Handle returned by prewarm(), or None to open a new stream
+        
+        Returns:
+            Opened, not yet started, input stream
+        """
+        if prewarmed is not None:
+            try:
+                return prewarmed.result()
+            except Exception as e:
+                log.warning(f"Could not prewarm microphone, reopening: {e}")
+        return self._open_stream()
+    
+    def _convert(self, start: int, end: int) -> np.ndarray:
+        """Convert a recorded float32 range to int16 in place and return it."""
+        audio_data = self._buffer[start:end]
+        audio_data_int16 = self._pcm[start:end]
+        np.clip(audio_data, -1.0, 1.0, out=audio_data)
+        np.multiply(audio_data, 32767, out=audio_data_int16, casting='unsafe')
+        return audio_data_int16
+    
+    def stream_frames(self, prewarmed: Optional[Future] = None,
+                      interval: float = 0.25) -> Iterator[np.ndarray]:
+        """
+        Record from the microphone, yielding audio as it arrives.
+        
+        Recording stops on silence or max_duration as with record_audio, so
+        a consumer can upload the answer while it is still being spoken.
+        
+        Args:
+            prewarmed: Handle returned by prewarm(), or None to open a new stream
+            interval: Seconds between yielded chunks
+        
+        Yields:
+            int16 PCM chunks (views into the recorder's buffer, valid until
+            the next recording)
+        """
+        self._write_index = 0
+        self._silence_samples = 0
+        self._stop.clear()
+        
+        stream = self._acquire_stream(prewarmed)
+        
+        log.info("Listening...")
+        
+        sent = 0
+        deadline = time.monotonic() + self.max_duration
+        
+        with stream:
+            while not self._stop.wait(timeout=interval) and time.monotonic() < deadline:
+                end = self._write_index
+                if end > sent:
+                    yield self._convert(sent, end)
+                    sent = end
+        
+        end = self._write_index
+        if end > sent:
+            yield self._convert(sent, end)
+    
+    def _record(self, prewarmed: Optional[Future] = None) -> Optional[np.ndarray]:
+        """
+        Record from the microphone until silence or max_duration.
+        
+        Args:
+            prewarmed: Handle returned by prewarm(), or None to open a new stream
+        
+        Returns:
+            int16 PCM samples (a view into the recorder's buffer, valid until
+            the next recording) or None if nothing was recorded
+        """
+        for _ in self.stream_frames(prewarmed):
+            pass
+        
+        return self._last_recording()
+    
+    def _last_recording(self) -> Optional[np.ndarray]:
+        """Return the int16 samples of the last recording, or None if it was empty."""
+        if self._write_index == 0:
+            log.warning("No audio recorded.")
+            return None
+        return self._pcm[:self._write_index]
+    
+    def _write_wav(self, file, audio_data_int16: np.ndarray):
+        """
+        Write 16-bit PCM samples as a WAV file.
+        
+        Args:
+            file: Writable binary file object
+            audio_data_int16: int16 samples to write
+        """
+        with wave.open(file, 'wb') as wav_file:
+            wav_file.setnchannels(self.channels)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(self.sample_rate)
+            wav_file.setnframes(len(audio_data_int16))
+            wav_file.writeframesraw(audio_data_int16)
+    
+    def record_audio(self, output_file: str, prewarmed: Optional[Future] = None) -> bool:
         """
         Record audio from microphone with automatic silence detection.
         
         Args:
             output_file: Path to save the WAV file
+            prewarmed: Handle returned by prewarm(), or None to open a new stream
             
         Returns:
             True if recording successful, False otherwise
         """
-        print("Listening...", flush=True)
-        
         try:
-            recording = []
-            silence_start = None
-            start_time = time.time()
-            
-            def callback(indata, frames, time_info, status):
-                """Callback function for audio stream processing."""
-                if status:
-                    print(f"Status: {status}", flush=True)
-                recording.append(indata.copy())
-            
-            with sd.InputStream(samplerate=self.sample_rate, 
-                              channels=self.channels, 
-                              callback=callback,
-                              dtype='float32'):
-                
-                while True:
-                    current_time = time.time()
-                    elapsed = current_time - start_time
-                    
-                    if elapsed >= self.max_duration:
-                        break
-                    
-                    if len(recording) > 0:
-                        recent_audio = recording[-1]
-                        rms = np.sqrt(np.mean(recent_audio**2))
-                        
-                        if rms < self.silence_threshold:
-                            if silence_start is None:
-                                silence_start = current_time
-                            elif current_time - silence_start >= self.silence_duration:
-                                break
-                        else:
-                            silence_start = None
-                    
-                    time.sleep(0.1)
-            
-            if not recording:
-                print("No audio recorded.", flush=True)
+            audio_data_int16 = self._record(prewarmed)
+            if audio_data_int16 is None:
                 return False
             
-            audio_data = np.concatenate(recording, axis=0)
-            audio_data_int16 = np.int16(audio_data * 32767)
-            write(output_file, self.sample_rate, audio_data_int16)
+            with open(output_file, 'wb', buffering=1 << 20) as f:
+                self._write_wav(f, audio_data_int16)
             
             return True
             
         except Exception as e:
-            print(f"Error recording audio: {e}", flush=True)
+            log.error(f"Error recording audio: {e}")
             return False
     
+    def last_recording_bytes(self) -> Optional[bytes]:
+        """
+        Get the most recent recording (e.g. from stream_frames) as a WAV file.
+        
+        Returns:
+            WAV file contents, or None if nothing was recorded
+        """
+        audio_data_int16 = self._last_recording()
+        if audio_data_int16 is None:
+            return None
+        
+        wav_buffer = io.BytesIO()
+        self._write_wav(wav_buffer, audio_data_int16)
+        return wav_buffer.getvalue()
+    
     def test_microphone(self) -> bool:
         """
         Test if microphone is available.
@@ -94,11 +251,8 @@ class AudioRecorder:
             True if microphone is accessible, False otherwise
         """
         try:
-            devices = sd.query_devices()
             default_input = sd.query_devices(kind='input')
-            if default_input:
-                return True
-            return False
+            return bool(default_input)
         except Exception as e:
-            print(f"Microphone test failed: {e}", flush=True)
+            log.error(f"Microphone test failed: {e}")
             return False
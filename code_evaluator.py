@@ -1,7 +1,29 @@
-from openai import OpenAI
+import logging
 import os
+import re
 from typing import Dict, Optional
 
+from llm_cache import LLMCache
+from llm_client import get_groq_client
+
+
+log = logging.getLogger("interview_agent.code_evaluator")
+
+
+_RE_CORRECTNESS = re.compile(r"Correctness:\s*(\d)", re.IGNORECASE)
+_RE_CODE_QUALITY = re.compile(r"Code Quality:\s*(\d)", re.IGNORECASE)
+_RE_EFFICIENCY = re.compile(r"Efficiency:\s*(\d)", re.IGNORECASE)
+_RE_OVERALL = re.compile(r"Overall Score:\s*(\d)", re.IGNORECASE)
+_RE_FEEDBACK = re.compile(r"Feedback:\s*(.+?)(?:\n\n|\Z)", re.IGNORECASE | re.DOTALL)
+_RE_EVALUATION = re.compile(
+    r"Correctness:\s*(?P<correctness>\d).*?"
+    r"Code Quality:\s*(?P<code_quality>\d).*?"
+    r"Efficiency:\s*(?P<efficiency>\d).*?"
+    r"Overall Score:\s*(?P<overall_score>\d).*?"
+    r"Feedback:\s*(?P<feedback>.+?)(?:\n\n|\Z)",
+    re.IGNORECASE | re.DOTALL
+)
+
 
 class CodeEvaluator:
     def __init__(self, api_key: str):
@@ -13,15 +35,28 @@ class CodeEvaluator:
         """
         self.client = None
         self.api_key = api_key
+        self.cache = LLMCache()
         
         if api_key and api_key != "your_groq_api_key_here":
             try:
-                self.client = OpenAI(
-                    api_key=api_key,
-                    base_url="https://api.groq.com/openai/v1"
-                )
+                self.client = get_groq_client(api_key)
             except Exception as e:
-                print(f"Warning: Could not initialize LLM client: {e}", flush=True)
+                log.warning(f"Warning: Could not initialize LLM client: {e}")
+    
+    def warm_up(self):
+        """
+        Open the connection to Groq ahead of the first evaluation.
+        
+        Meant to run in the background while the candidate is writing code,
+        so the evaluation request does not pay for the TLS handshake.
+        """
+        if not self.client:
+            return
+        
+        try:
+            self.client.models.list()
+        except Exception as e:
+            log.warning(f"Warning: Could not warm up LLM connection: {e}")
     
     def evaluate_code(self, question: str, code: str) -> Dict[str, any]:
         """
@@ -70,22 +105,37 @@ Feedback: [Your feedback here]
 
 Replace X with numbers 1-5."""
 
+        request = {
+            "model": "llama-3.3-70b-versatile",
+            "messages": [
+                {"role": "system", "content": "You are an expert programming interviewer who provides objective code evaluation."},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0.3,
+            "max_tokens": 500
+        }
+        
         try:
-            response = self.client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[
-                    {"role": "system", "content": "You are an expert programming interviewer who provides objective code evaluation."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=500
-            )
+            result_text = self.cache.get(request)
+            if result_text is None:
+                response = self.client.chat.completions.create(**request)
+                result_text = response.choices[0].message.content.strip()
+                if _RE_EVALUATION.search(result_text):
+                    self.cache.put(request, result_text)
             
-            result_text = response.choices[0].message.content.strip()
             return self._parse_code_evaluation(result_text)
             
+        except LookupError as e:
+            log.warning(f"Warning: {e}, code not evaluated")
+            return {
+                "correctness": 3,
+                "code_quality": 3,
+                "efficiency": 3,
+                "overall_score": 3,
+                "feedback": "No cached evaluation for this solution (LLM_CACHE_MODE=replay)"
+            }
         except Exception as e:
-            print(f"Error during code evaluation: {e}", flush=True)
+            log.error(f"Error during code evaluation: {e}")
             return {
                 "correctness": 3,
                 "code_quality": 3,
@@ -104,8 +154,6 @@ Replace X with numbers 1-5."""
         Returns:
             Dictionary with parsed scores and feedback
         """
-        import re
-        
         result = {
             "correctness": 3,
             "code_quality": 3,
@@ -114,23 +162,32 @@ Replace X with numbers 1-5."""
             "feedback": ""
         }
         
-        correctness_match = re.search(r"Correctness:\s*(\d)", llm_response, re.IGNORECASE)
+        match = _RE_EVALUATION.search(llm_response)
+        if match:
+            result["correctness"] = int(match.group("correctness"))
+            result["code_quality"] = int(match.group("code_quality"))
+            result["efficiency"] = int(match.group("efficiency"))
+            result["overall_score"] = int(match.group("overall_score"))
+            result["feedback"] = match.group("feedback").strip()
+            return result
+        
+        correctness_match = _RE_CORRECTNESS.search(llm_response)
         if correctness_match:
             result["correctness"] = int(correctness_match.group(1))
         
-        quality_match = re.search(r"Code Quality:\s*(\d)", llm_response, re.IGNORECASE)
+        quality_match = _RE_CODE_QUALITY.search(llm_response)
         if quality_match:
             result["code_quality"] = int(quality_match.group(1))
         
-        efficiency_match = re.search(r"Efficiency:\s*(\d)", llm_response, re.IGNORECASE)
+        efficiency_match = _RE_EFFICIENCY.search(llm_response)
         if efficiency_match:
             result["efficiency"] = int(efficiency_match.group(1))
         
-        overall_match = re.search(r"Overall Score:\s*(\d)", llm_response, re.IGNORECASE)
+        overall_match = _RE_OVERALL.search(llm_response)
         if overall_match:
             result["overall_score"] = int(overall_match.group(1))
         
-        feedback_match = re.search(r"Feedback:\s*(.+?)(?:\n\n|\Z)", llm_response, re.IGNORECASE | re.DOTALL)
+        feedback_match = _RE_FEEDBACK.search(llm_response)
         if feedback_match:
             result["feedback"] = feedback_match.group(1).strip()
         
@@ -1,6 +1,51 @@
-from typing import Dict, List
+import logging
+from typing import Dict, List, Optional, Set
 import re
-from openai import OpenAI
+from collections import Counter
+import numpy as np
+
+from llm_cache import LLMCache
+from llm_client import get_groq_client
+from semantic_cache import SemanticCache
+
+
+log = logging.getLogger("interview_agent.evaluator")
+
+
+_SCORE_PATTERNS = (
+    ("Relevance", re.compile(r"Relevance:\s*(\d)", re.IGNORECASE)),
+    ("Clarity", re.compile(r"Clarity:\s*(\d)", re.IGNORECASE)),
+    ("Confidence", re.compile(r"Confidence:\s*(\d)", re.IGNORECASE)),
+    ("Technical Accuracy", re.compile(r"Technical Accuracy:\s*(\d)", re.IGNORECASE))
+)
+_SENTENCE_SPLIT = re.compile(r'[.!?]+')
+_COMMON_WORDS = frozenset({"the", "a", "an", "is", "are", "was", "were", "of", "to", "in", "for", "and", "or"})
+
+_PHRASE_CATEGORIES = {
+    "filler": ("um", "uh", "like", "you know", "basically", "actually", "literally"),
+    "uncertain": (
+        "i think", "maybe", "i guess", "i'm not sure", "probably",
+        "i don't know", "perhaps", "kind of", "sort of", "i believe"
+    ),
+    "confident": (
+        "i know", "definitely", "certainly", "absolutely", "clearly",
+        "obviously", "i'm confident", "without a doubt", "i'm certain"
+    ),
+    "technical": (
+        "algorithm", "data structure", "complexity", "optimization", "architecture",
+        "design pattern", "api", "database", "system", "framework", "implementation",
+        "interface", "method", "function", "class", "object", "variable", "parameter",
+        "memory", "performance", "scalability", "security", "testing", "debugging",
+        "deployment", "integration", "protocol", "encryption", "authentication"
+    )
+}
+
+# Zero-width lookahead so every start position is tested: the counts equal
+# summing str.count() per phrase, since no phrase is a prefix of another.
+_PHRASE_PATTERN = re.compile("(?=" + "|".join(
+    f"(?P<{category}>{'|'.join(re.escape(phrase) for phrase in phrases)})"
+    for category, phrases in _PHRASE_CATEGORIES.items()
+) + ")")
 
 
 class ResponseEvaluator:
@@ -14,15 +59,14 @@ class ResponseEvaluator:
         self.score_categories = ["Relevance", "Clarity", "Confidence", "Technical Accuracy"]
         self.client = None
         self.api_key = api_key
+        self.cache = LLMCache()
+        self.semantic_cache = SemanticCache()
         
         if api_key and api_key != "your_groq_api_key_here":
             try:
-                self.client = OpenAI(
-                    api_key=api_key,
-                    base_url="https://api.groq.com/openai/v1"
-                )
+                self.client = get_groq_client(api_key)
             except Exception as e:
-                print(f"Warning: Could not initialize LLM client: {e}", flush=True)
+                log.warning(f"Warning: Could not initialize LLM client: {e}")
         
     def evaluate_response(self, question: str, transcription: str) -> Dict[str, int]:
         """
@@ -35,18 +79,31 @@ class ResponseEvaluator:
         Returns:
             Dictionary with scores for each category (1-5 scale)
         """
-        if self.client:
-            return self._evaluate_with_llm(question, transcription)
-        else:
+        if not self.client:
             return self._evaluate_fallback(question, transcription)
+        
+        try:
+            vector = self.semantic_cache.embed(transcription)
+            if vector is not None:
+                cached_scores = self.semantic_cache.lookup(vector, question)
+                if cached_scores is not None:
+                    return cached_scores
+        except Exception as e:
+            log.warning(f"Warning: Semantic cache lookup failed: {e}")
+            vector = None
+        
+        return self._evaluate_with_llm(question, transcription, vector)
     
-    def _evaluate_with_llm(self, question: str, transcription: str) -> Dict[str, int]:
+    def _evaluate_with_llm(self, question: str, transcription: str,
+                           vector: Optional[np.ndarray] = None) -> Dict[str, int]:
         """
         Use LLM to evaluate the response and provide scores.
         
         Args:
             question: The interview question
             transcription: The candidate's answer
+            vector: Semantic cache embedding of the pair; LLM scores are
+                    stored under it when given
             
         Returns:
             Dictionary with scores for each category
@@ -74,30 +131,68 @@ Technical Accuracy: X
 
 Replace X with numbers 1-5. No additional text or explanation."""
 
+        request = {
+            "model": "llama-3.3-70b-versatile",
+            "messages": [
+                {"role": "system", "content": "You are an expert technical interviewer who provides objective scoring."},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0.3,
+            "max_tokens": 200
+        }
+        
         try:
-            response = self.client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[
-                    {"role": "system", "content": "You are an expert technical interviewer who provides objective scoring."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=200
-            )
+            result_text = self.cache.get(request)
+            cached = result_text is not None
+            if not cached:
+                result_text = self._stream_scores(request)
             
-            result_text = response.choices[0].message.content.strip()
             scores = self._parse_llm_scores(result_text)
             
             if scores:
+                if not cached:
+                    self.cache.put(request, result_text)
+                if vector is not None:
+                    try:
+                        self.semantic_cache.store(vector, question, scores)
+                    except Exception as e:
+                        log.warning(f"Warning: Could not update semantic cache: {e}")
                 return scores
             else:
-                print("Warning: Could not parse LLM scores, using fallback evaluation", flush=True)
+                log.warning("Warning: Could not parse LLM scores, using fallback evaluation")
                 return self._evaluate_fallback(question, transcription)
                 
+        except LookupError as e:
+            log.warning(f"Warning: {e}, using fallback evaluation")
+            return self._evaluate_fallback(question, transcription)
         except Exception as e:
-            print(f"Error during LLM evaluation: {e}", flush=True)
+            log.error(f"Error during LLM evaluation: {e}")
             return self._evaluate_fallback(question, transcription)
     
+    def _stream_scores(self, request: Dict) -> str:
+        """
+        Stream the scoring completion and stop once all four scores arrive.
+        
+        Args:
+            request: Keyword arguments for chat.completions.create
+            
+        Returns:
+            Response text received up to the point all scores were parsed
+        """
+        stream = self.client.chat.completions.create(stream=True, **request)
+        parts = []
+        try:
+            for chunk in stream:
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                parts.append(chunk.choices[0].delta.content)
+                if self._parse_llm_scores("".join(parts)):
+                    break
+        finally:
+            stream.close()
+        
+        return "".join(parts).strip()
+    
     def _parse_llm_scores(self, llm_response: str) -> Dict[str, int]:
         """
         Parse scores from LLM response.
@@ -110,15 +205,8 @@ Replace X with numbers 1-5. No additional text or explanation."""
         """
         scores = {}
         
-        patterns = {
-            "Relevance": r"Relevance:\s*(\d)",
-            "Clarity": r"Clarity:\s*(\d)",
-            "Confidence": r"Confidence:\s*(\d)",
-            "Technical Accuracy": r"Technical Accuracy:\s*(\d)"
-        }
-        
-        for category, pattern in patterns.items():
-            match = re.search(pattern, llm_response, re.IGNORECASE)
+        for category, pattern in _SCORE_PATTERNS:
+            match = pattern.search(llm_response)
             if match:
                 score = int(match.group(1))
                 scores[category] = max(1, min(5, score))
@@ -138,35 +226,52 @@ Replace X with numbers 1-5. No additional text or explanation."""
         Returns:
             Dictionary with scores for each category
         """
+        text_lower = transcription.lower() if transcription else ""
+        words = text_lower.split()
+        
+        if not words:
+            return {category: 1 for category in self.score_categories}
+        if len(words) < 5:
+            return {category: 2 for category in self.score_categories}
+        
+        sentences = [s.strip() for s in _SENTENCE_SPLIT.split(transcription) if s.strip()]
+        question_keywords = set(question.lower().split()) - _COMMON_WORDS
+        phrase_counts = self._count_phrases(text_lower)
+        
         scores = {}
         
-        scores["Relevance"] = self._evaluate_relevance(question, transcription)
-        scores["Clarity"] = self._evaluate_clarity(transcription)
-        scores["Confidence"] = self._evaluate_confidence(transcription)
-        scores["Technical Accuracy"] = self._evaluate_technical_accuracy(question, transcription)
+        scores["Relevance"] = self._evaluate_relevance(words, question_keywords)
+        scores["Clarity"] = self._evaluate_clarity(words, sentences, phrase_counts)
+        scores["Confidence"] = self._evaluate_confidence(words, phrase_counts)
+        scores["Technical Accuracy"] = self._evaluate_technical_accuracy(words, phrase_counts)
         
         return scores
     
-    def _evaluate_relevance(self, question: str, transcription: str) -> int:
+    def _count_phrases(self, text_lower: str) -> Counter:
         """
-        Score how relevant the response is to the question.
+        Count filler, uncertain, confident and technical phrases in one scan.
         
-        Returns: Score 1-5
+        Args:
+            text_lower: Lowercased transcription
+            
+        Returns:
+            Counter mapping category name to number of phrase occurrences
         """
-        if not transcription or len(transcription.strip()) == 0:
-            return 1
-        
-        words = transcription.lower().split()
-        question_words = set(question.lower().split())
+        return Counter(match.lastgroup for match in _PHRASE_PATTERN.finditer(text_lower))
+    
+    def _evaluate_relevance(self, words: List[str], question_keywords: Set[str]) -> int:
+        """
+        Score how relevant the response is to the question.
         
-        common_words = {"the", "a", "an", "is", "are", "was", "were", "of", "to", "in", "for", "and", "or"}
-        question_keywords = question_words - common_words
+        Args:
+            words: Lowercased words of the transcription (at least 5)
+            question_keywords: Lowercased question words minus common words
         
+        Returns: Score 1-5
+        """
         overlap = sum(1 for word in words if word in question_keywords)
         
-        if len(words) < 5:
-            return 2
-        elif overlap == 0:
+        if overlap == 0:
             return 2
         elif overlap <= 2:
             return 3
@@ -175,27 +280,19 @@ Replace X with numbers 1-5. No additional text or explanation."""
         else:
             return 5
     
-    def _evaluate_clarity(self, transcription: str) -> int:
+    def _evaluate_clarity(self, words: List[str], sentences: List[str], phrase_counts: Counter) -> int:
         """
         Score the clarity and structure of the response.
         
+        Args:
+            words: Lowercased words of the transcription (at least 5)
+            sentences: Non-empty sentences of the transcription
+            phrase_counts: Phrase counts from _count_phrases
+        
         Returns: Score 1-5
         """
-        if not transcription or len(transcription.strip()) == 0:
-            return 1
-        
-        words = transcription.split()
         word_count = len(words)
-        
-        if word_count < 5:
-            return 2
-        
-        sentences = re.split(r'[.!?]+', transcription)
-        sentences = [s.strip() for s in sentences if s.strip()]
-        
-        filler_words = ["um", "uh", "like", "you know", "basically", "actually", "literally"]
-        filler_count = sum(transcription.lower().count(filler) for filler in filler_words)
-        filler_ratio = filler_count / max(word_count, 1)
+        filler_ratio = phrase_counts["filler"] / word_count
         
         if filler_ratio > 0.2:
             clarity_score = 2
@@ -210,35 +307,18 @@ Replace X with numbers 1-5. No additional text or explanation."""
         
         return clarity_score
     
-    def _evaluate_confidence(self, transcription: str) -> int:
+    def _evaluate_confidence(self, words: List[str], phrase_counts: Counter) -> int:
         """
         Score the confidence level based on language patterns.
         
+        Args:
+            words: Lowercased words of the transcription (at least 5)
+            phrase_counts: Phrase counts from _count_phrases
+        
         Returns: Score 1-5
         """
-        if not transcription or len(transcription.strip()) == 0:
-            return 1
-        
-        uncertain_phrases = [
-            "i think", "maybe", "i guess", "i'm not sure", "probably",
-            "i don't know", "perhaps", "kind of", "sort of", "i believe"
-        ]
-        
-        confident_phrases = [
-            "i know", "definitely", "certainly", "absolutely", "clearly",
-            "obviously", "i'm confident", "without a doubt", "i'm certain"
-        ]
-        
-        text_lower = transcription.lower()
-        
-        uncertain_count = sum(text_lower.count(phrase) for phrase in uncertain_phrases)
-        confident_count = sum(text_lower.count(phrase) for phrase in confident_phrases)
-        
-        words = transcription.split()
-        word_count = len(words)
-        
-        if word_count < 5:
-            return 2
+        uncertain_count = phrase_counts["uncertain"]
+        confident_count = phrase_counts["confident"]
         
         if uncertain_count > confident_count + 2:
             return 2
@@ -249,31 +329,17 @@ Replace X with numbers 1-5. No additional text or explanation."""
         else:
             return 4
     
-    def _evaluate_technical_accuracy(self, question: str, transcription: str) -> int:
+    def _evaluate_technical_accuracy(self, words: List[str], phrase_counts: Counter) -> int:
         """
         Score technical accuracy based on terminology and depth.
         
+        Args:
+            words: Lowercased words of the transcription (at least 5)
+            phrase_counts: Phrase counts from _count_phrases
+        
         Returns: Score 1-5
         """
-        if not transcription or len(transcription.strip()) == 0:
-            return 1
-        
-        technical_indicators = [
-            "algorithm", "data structure", "complexity", "optimization", "architecture",
-            "design pattern", "api", "database", "system", "framework", "implementation",
-            "interface", "method", "function", "class", "object", "variable", "parameter",
-            "memory", "performance", "scalability", "security", "testing", "debugging",
-            "deployment", "integration", "protocol", "encryption", "authentication"
-        ]
-        
-        text_lower = transcription.lower()
-        technical_count = sum(text_lower.count(term) for term in technical_indicators)
-        
-        words = transcription.split()
-        word_count = len(words)
-        
-        if word_count < 5:
-            return 2
+        technical_count = phrase_counts["technical"]
         
         if technical_count == 0:
             return 2
@@ -316,12 +382,13 @@ Replace X with numbers 1-5. No additional text or explanation."""
         if not all_scores:
             return {cat: 0.0 for cat in self.score_categories}
         
-        averages = {}
-        for category in self.score_categories:
-            total = sum(scores.get(category, 0) for scores in all_scores)
-            averages[category] = round(total / len(all_scores), 2)
+        score_matrix = np.array(
+            [[scores.get(category, 0) for category in self.score_categories] for scores in all_scores],
+            dtype=np.float64
+        )
+        means = score_matrix.mean(axis=0)
         
-        return averages
+        return {category: round(mean, 2) for category, mean in zip(self.score_categories, means.tolist())}
     
     def get_recommendation(self, average_scores: Dict[str, float]) -> str:
         """
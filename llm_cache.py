@@ -0,0 +1,127 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+log = logging.getLogger("interview_agent.llm_cache")
+
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".ai_interview_cache.sqlite")
+CACHE_MODES = ("readwrite", "replay", "off")
+
+
+class LLMCache:
+    def __init__(self, path: Optional[str] = None, mode: Optional[str] = None):
+        """
+        Initialize an on-disk cache of LLM chat completions.
+
+        Args:
+            path: Path to the SQLite database file. Defaults to the
+                  LLM_CACHE_PATH environment variable, then DEFAULT_CACHE_PATH.
+            mode: "readwrite" to serve hits and store misses, "replay" to serve
+                  only cached responses, "off" to bypass the cache. Defaults to
+                  the LLM_CACHE_MODE environment variable, then "off", since
+                  the cache stores candidates' answers in plain text.
+        """
+        self.path = path or os.getenv("LLM_CACHE_PATH") or DEFAULT_CACHE_PATH
+        self.mode = (mode or os.getenv("LLM_CACHE_MODE") or "off").strip().lower()
+        if self.mode not in CACHE_MODES:
+            log.warning(f"Warning: Unknown LLM_CACHE_MODE '{self.mode}', cache disabled")
+            self.mode = "off"
+
+        self._conn = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(request: Dict[str, Any]) -> str:
+        """
+        Build the cache key for a chat completion request.
+
+        Args:
+            request: Keyword arguments passed to chat.completions.create
+
+        Returns:
+            SHA256 hex digest of the model, messages, temperature and max_tokens
+        """
+        payload = {
+            "model": request.get("model"),
+            "messages": request.get("messages"),
+            "temperature": request.get("temperature"),
+            "max_tokens": request.get("max_tokens")
+        }
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use and create the table if needed."""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, response TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, request: Dict[str, Any]) -> Optional[str]:
+        """
+        Look up the cached response text for a request.
+
+        Args:
+            request: Keyword arguments passed to chat.completions.create
+
+        Returns:
+            Cached response text, or None on a miss
+
+        Raises:
+            LookupError: On a miss in replay mode
+        """
+        if self.mode == "off":
+            return None
+
+        key = self.make_key(request)
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT response FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+        except (sqlite3.Error, OSError) as e:
+            log.warning(f"Warning: LLM cache read failed: {e}")
+            row = None
+
+        if row is not None:
+            return row[0]
+        if self.mode == "replay":
+            raise LookupError("LLM response not found in replay cache")
+        return None
+
+    def put(self, request: Dict[str, Any], response: str):
+        """
+        Store the response text for a request.
+
+        Args:
+            request: Keyword arguments passed to chat.completions.create
+            response: Response text returned by the model
+        """
+        if self.mode != "readwrite":
+            return
+
+        key = self.make_key(request)
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, created) VALUES (?, ?, ?)",
+                    (key, response, time.time())
+                )
+                conn.commit()
+        except (sqlite3.Error, OSError) as e:
+            log.warning(f"Warning: LLM cache write failed: {e}")
@@ -0,0 +1,63 @@
+import functools
+import httpx
+from openai import OpenAI
+
+
+GROQ_BASE_URL = "https://api.groq.com/openai/v1"
+
+
+def create_http_client() -> httpx.Client:
+    """
+    Create the HTTP client used for Groq API calls.
+
+    HTTP/2 multiplexes requests over one kept-alive connection, so calls
+    after the first skip the TCP and TLS handshakes.
+
+    Returns:
+        httpx client with HTTP/2 and connection pooling enabled
+    """
+    return httpx.Client(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=4, max_connections=8),
+        timeout=60.0
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def get_http_client() -> httpx.Client:
+    """
+    Get the HTTP client shared by every Groq request in the process.
+
+    Returns:
+        Pooled httpx client from create_http_client()
+    """
+    return create_http_client()
+
+
+@functools.lru_cache(maxsize=1)
+def get_groq_client(api_key: str) -> OpenAI:
+    """
+    Get the shared OpenAI client configured for the Groq endpoint.
+
+    The client is built on first use and reused by every caller passing the
+    same key, so all components share one connection pool.
+
+    Args:
+        api_key: Groq API key
+
+    Returns:
+        OpenAI client pointed at Groq
+    """
+    return OpenAI(
+        api_key=api_key,
+        base_url=GROQ_BASE_URL,
+        http_client=get_http_client()
+    )
+
+
+def close_clients():
+    """Close the shared connection pool; later calls build fresh clients."""
+    if get_http_client.cache_info().currsize:
+        get_http_client().close()
+    get_groq_client.cache_clear()
+    get_http_client.cache_clear()
@@ -1,7 +1,13 @@
 import os
 import sys
 import random
-from typing import List, Dict
+import logging
+import queue
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from logging.handlers import QueueHandler, QueueListener
+from typing import List, Dict, Optional, Tuple
 from dotenv import load_dotenv
 
 from audio import AudioRecorder
@@ -9,15 +15,109 @@ from transcriber import SpeechTranscriber
 from evaluator import ResponseEvaluator
 from tts import TextToSpeech
 from code_evaluator import CodeEvaluator
+from llm_client import close_clients
+
+
+log = logging.getLogger("interview_agent")
+
+load_dotenv()
+GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
+
+ROLE_QUESTIONS: Dict[str, Tuple[str, ...]] = {
+    "Software Engineer": (
+        "Tell me about a challenging technical project you've worked on recently.",
+        "How do you approach debugging a complex issue in production?",
+        "Explain the difference between synchronous and asynchronous programming.",
+        "What is your experience with version control systems like Git?",
+        "How do you ensure code quality and maintainability in your projects?"
+    ),
+    "Data Analyst": (
+        "How do you approach data cleaning and preprocessing?",
+        "Can you explain the difference between correlation and causation?",
+        "What data visualization tools have you used and which do you prefer?",
+        "Describe a time when you used data to solve a business problem.",
+        "How do you handle missing or incomplete data in your analysis?"
+    ),
+    "Cloud Engineer": (
+        "What is your experience with cloud platforms like AWS, Azure, or GCP?",
+        "How do you ensure security and compliance in cloud deployments?",
+        "Explain the concept of Infrastructure as Code and why it's important.",
+        "How do you approach designing scalable and fault-tolerant systems?",
+        "What monitoring and logging strategies do you use for cloud applications?"
+    ),
+    "HR Screening": (
+        "How do you handle deadlines or work pressure?",
+        "Can you describe a challenge you faced at work and how you solved it?",
+        "Do you prefer working independently or in a team? Why?",
+        "What motivates you in your professional career?",
+        "Tell me about a time when you had to adapt to a significant change at work."
+    ),
+    "Coding Test": (
+        "Write a function to reverse a string without using built-in reverse methods.",
+        "Given an array of integers, find two numbers that add up to a target sum.",
+        "Write a function to check if a string is a valid palindrome (ignoring spaces and case)."
+    )
+}
+
+ROLE_MAP: Dict[str, str] = {
+    "1": "Software Engineer",
+    "2": "Data Analyst",
+    "3": "Cloud Engineer",
+    "4": "HR Screening",
+    "5": "Coding Test"
+}
+
+
+@dataclass(slots=True)
+class InterviewRecord:
+    """Outcome of one interview question or coding problem."""
+    question: str
+    scores: Dict[str, int]
+    transcription: Optional[str] = None
+    code: Optional[str] = None
+    feedback: Optional[str] = None
+
+
+def start_console_log() -> QueueListener:
+    """
+    Start writing log messages to stdout on a background thread.
+    
+    Every component logs under the "interview_agent" logger, so all console
+    output goes through one queue and keeps the order it was logged in,
+    while the writes themselves happen off the interview's critical path.
+    
+    Returns:
+        The running listener; pass it to stop_console_log when done
+    """
+    log_queue = queue.SimpleQueue()
+    log.addHandler(QueueHandler(log_queue))
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = QueueListener(log_queue, handler)
+    listener.start()
+    return listener
+
+
+def stop_console_log(listener: QueueListener):
+    """
+    Write any queued messages and detach the queue from the logger.
+    
+    Args:
+        listener: Listener returned by start_console_log
+    """
+    listener.stop()
+    for handler in list(log.handlers):
+        if isinstance(handler, QueueHandler) and handler.queue is listener.queue:
+            log.removeHandler(handler)
+    log.propagate = True
 
 
 class InterviewAgent:
     def __init__(self):
         """Initialize the interview agent with all components."""
-        load_dotenv()
-        
-        groq_api_key = os.getenv("GROQ_API_KEY", "")
-        
         self.audio_recorder = AudioRecorder(
             sample_rate=16000,
             silence_threshold=0.01,
@@ -25,55 +125,43 @@ class InterviewAgent:
             max_duration=60.0
         )
         self.transcriber = SpeechTranscriber(
-            api_key=groq_api_key,
-            model_name="whisper-large-v3-turbo"
+            api_key=GROQ_API_KEY,
+            model_name="whisper-large-v3-turbo",
+            compress_audio=True
         )
-        self.evaluator = ResponseEvaluator(api_key=groq_api_key)
+        self.evaluator = ResponseEvaluator(api_key=GROQ_API_KEY)
         self.tts = TextToSpeech(voice="en-US-GuyNeural")
-        self.code_evaluator = CodeEvaluator(api_key=groq_api_key)
-        
-        self.role_questions = {
-            "Software Engineer": [
-                "Tell me about a challenging technical project you've worked on recently.",
-                "How do you approach debugging a complex issue in production?",
-                "Explain the difference between synchronous and asynchronous programming.",
-                "What is your experience with version control systems like Git?",
-                "How do you ensure code quality and maintainability in your projects?"
-            ],
-            "Data Analyst": [
-                "How do you approach data cleaning and preprocessing?",
-                "Can you explain the difference between correlation and causation?",
-                "What data visualization tools have you used and which do you prefer?",
-                "Describe a time when you used data to solve a business problem.",
-                "How do you handle missing or incomplete data in your analysis?"
-            ],
-            "Cloud Engineer": [
-                "What is your experience with cloud platforms like AWS, Azure, or GCP?",
-                "How do you ensure security and compliance in cloud deployments?",
-                "Explain the concept of Infrastructure as Code and why it's important.",
-                "How do you approach designing scalable and fault-tolerant systems?",
-                "What monitoring and logging strategies do you use for cloud applications?"
-            ],
-            "HR Screening": [
-                "How do you handle deadlines or work pressure?",
-                "Can you describe a challenge you faced at work and how you solved it?",
-                "Do you prefer working independently or in a team? Why?",
-                "What motivates you in your professional career?",
-                "Tell me about a time when you had to adapt to a significant change at work."
-            ],
-            "Coding Test": [
-                "Write a function to reverse a string without using built-in reverse methods.",
-                "Given an array of integers, find two numbers that add up to a target sum.",
-                "Write a function to check if a string is a valid palindrome (ignoring spaces and case)."
-            ]
-        }
+        self.code_evaluator = CodeEvaluator(api_key=GROQ_API_KEY)
+        
+        self.role_questions = ROLE_QUESTIONS
         
         self.selected_role = None
         self.questions = []
         
         self.all_scores = []
-        self.interview_data = []
+        self.interview_data: List[InterviewRecord] = []
+        
+        self.executor = ThreadPoolExecutor(max_workers=4)
+        self.pending_evaluations = []
+        self.pending_code_evaluations = []
+        
+        self.log_listener = None
+        
+    def _prompt(self, message: str) -> str:
+        """
+        Wait for queued console output to be written, then read user input.
         
+        Args:
+            message: Prompt shown to the user
+            
+        Returns:
+            The line entered by the user
+        """
+        if self.log_listener is not None:
+            self.log_listener.stop()
+            self.log_listener.start()
+        return input(message)
+    
     def select_role(self) -> bool:
         """
         Ask user to select interview role.
@@ -81,51 +169,59 @@ class InterviewAgent:
         Returns:
             True if role selected successfully, False otherwise
         """
-        print("=" * 50)
-        print("AI INTERVIEW AGENT")
-        print("=" * 50)
-        print()
-        
-        print("Select the interview role:")
-        print("1. 💻 Software Engineer")
-        print("2. 📊 Data Analyst")
-        print("3. ☁️  Cloud Engineer")
-        print("4. 🧠 HR Screening (non-technical)")
-        print("5. 👨‍💻 Coding Test")
-        print()
+        log.info("=" * 50)
+        log.info("AI INTERVIEW AGENT")
+        log.info("=" * 50)
+        log.info("")
+        
+        log.info("Select the interview role:")
+        log.info("1. 💻 Software Engineer")
+        log.info("2. 📊 Data Analyst")
+        log.info("3. ☁️  Cloud Engineer")
+        log.info("4. 🧠 HR Screening (non-technical)")
+        log.info("5. 👨‍💻 Coding Test")
+        log.info("")
         
         while True:
             try:
-                choice = input("Enter your choice (1-5): ").strip()
+                choice = self._prompt("Enter your choice (1-5): ").strip()
                 
-                role_map = {
-                    "1": "Software Engineer",
-                    "2": "Data Analyst",
-                    "3": "Cloud Engineer",
-                    "4": "HR Screening",
-                    "5": "Coding Test"
-                }
-                
-                if choice in role_map:
-                    self.selected_role = role_map[choice]
-                    print(f"\nSelected: {self.selected_role}")
-                    print()
+                if choice in ROLE_MAP:
+                    self.selected_role = ROLE_MAP[choice]
+                    log.info(f"\nSelected: {self.selected_role}")
+                    log.info("")
                     
-                    if self.selected_role == "Coding Test":
-                        self.questions = self.role_questions[self.selected_role]
-                    else:
-                        self.questions = random.sample(self.role_questions[self.selected_role], 3)
+                    self.questions = self._pick_questions(self.selected_role)
                     return True
                 else:
-                    print("Invalid choice. Please enter 1, 2, 3, 4, or 5.")
+                    log.info("Invalid choice. Please enter 1, 2, 3, 4, or 5.")
                     
             except KeyboardInterrupt:
-                print("\n\nInterview cancelled.")
+                log.info("\n\nInterview cancelled.")
                 return False
             except Exception as e:
-                print(f"Error: {e}")
+                log.error(f"Error: {e}")
                 return False
     
+    def _pick_questions(self, role: str) -> List[str]:
+        """
+        Choose the questions for a role.
+        
+        Voice roles get 3 random questions, seeded by INTERVIEW_SEED when set;
+        the coding test always uses all of its problems in order.
+        
+        Args:
+            role: Selected interview role
+            
+        Returns:
+            Questions to ask
+        """
+        if role == "Coding Test":
+            return list(self.role_questions[role])
+        
+        rng = random.Random(os.getenv("INTERVIEW_SEED") or None)
+        return rng.sample(self.role_questions[role], 3)
+    
     def setup(self) -> bool:
         """
         Set up the interview environment.
@@ -133,20 +229,53 @@ class InterviewAgent:
         Returns:
             True if setup successful, False otherwise
         """
-        
-        print("Testing microphone...", flush=True)
+        log.info("Testing microphone...")
         if not self.audio_recorder.test_microphone():
-            print("ERROR: Microphone not accessible.", flush=True)
+            log.error("ERROR: Microphone not accessible.")
             return False
-        print("Microphone ready.", flush=True)
-        print()
+        log.info("Microphone ready.")
+        log.info("")
         
         if not self.transcriber.load_model():
-            print("ERROR: Failed to load transcription model.", flush=True)
+            log.error("ERROR: Failed to load transcription model.")
             return False
-        print()
+        log.info("")
         
         return True
+    def _record_and_transcribe(self, microphone) -> Optional[str]:
+        """
+        Record an answer while uploading it for transcription.
+        
+        Falls back to uploading the finished recording if the streaming
+        request fails.
+        
+        Args:
+            microphone: Handle returned by AudioRecorder.prewarm()
+            
+        Returns:
+            Transcribed text, or None if recording or transcription failed
+        """
+        transcription = self.transcriber.transcribe_stream(
+            self.audio_recorder.stream_frames(microphone),
+            self.audio_recorder.sample_rate
+        )
+        log.info("Recording complete.")
+        log.info("")
+        
+        if transcription is None:
+            audio = self.audio_recorder.last_recording_bytes()
+            if audio is None:
+                log.error("Failed to record audio.")
+                return None
+            
+            log.info("Retrying transcription...")
+            log.info("")
+            transcription = self.transcriber.transcribe(audio)
+        
+        if transcription is None:
+            log.error("Transcription failed.")
+        return transcription
+    
     def ask_question(self, question_num: int, question: str) -> bool:
         """
         Ask a single interview question and process the response.
@@ -158,85 +287,74 @@ class InterviewAgent:
         Returns:
             True if question processed successfully, False otherwise
         """
-        print("-" * 40)
-        print(f"QUESTION {question_num}:")
-        print(question)
-        print()
+        speech = self.tts.speak_async(question)
+        microphone = self.audio_recorder.prewarm()
         
-        print("Speaking question...", flush=True)
-        self.tts.speak(question)
-        print()
+        log.info("-" * 40)
+        log.info(f"QUESTION {question_num}:")
+        log.info(question)
+        log.info("")
         
-        audio_file = f"recording_{question_num}.wav"
+        log.info("Speaking question...")
+        self.tts.play(speech)
+        log.info("")
         
-        input("Press Enter when ready to answer...")
-        print()
-        
-        if not self.audio_recorder.record_audio(audio_file):
-            print("Failed to record audio.", flush=True)
-            return False
-        
-        print("Recording complete. Transcribing...", flush=True)
-        print()
-        
-        transcription = self.transcriber.transcribe(audio_file)
+        self._prompt("Press Enter when ready to answer...")
+        log.info("")
         
+        transcription = self._record_and_transcribe(microphone)
         if transcription is None:
-            print("Transcription failed.", flush=True)
             return False
         
-        print("TRANSCRIPTION:")
-        print(transcription)
-        print()
+        log.info("TRANSCRIPTION:")
+        log.info(transcription)
+        log.info("")
+        
+        parts = [transcription]
         
         if not self.evaluator.is_answer_sufficient(transcription):
-            print("Follow-up needed: Please provide a more detailed answer.")
-            print()
+            log.info("Follow-up needed: Please provide a more detailed answer.")
+            log.info("")
             
-            audio_file_followup = f"recording_{question_num}_followup.wav"
-            input("Press Enter when ready to continue...")
-            print()
+            microphone = self.audio_recorder.prewarm()
+            self._prompt("Press Enter when ready to continue...")
+            log.info("")
             
-            if self.audio_recorder.record_audio(audio_file_followup):
-                print("Recording complete. Transcribing follow-up...", flush=True)
-                print()
-                
-                followup_transcription = self.transcriber.transcribe(audio_file_followup)
-                if followup_transcription:
-                    transcription = transcription + " " + followup_transcription
-                    print("UPDATED TRANSCRIPTION:")
-                    print(transcription)
-                    print()
-                
-                try:
-                    os.remove(audio_file_followup)
-                except:
-                    pass
-        
-        scores = self.evaluator.evaluate_response(question, transcription)
-        
-        print("SCORES:")
-        for category, score in scores.items():
-            print(f"- {category}: {score}/5")
-        print()
+            followup_transcription = self._record_and_transcribe(microphone)
+            if followup_transcription:
+                parts.append(followup_transcription)
+                transcription = " ".join(parts)
+                log.info("UPDATED TRANSCRIPTION:")
+                log.info(transcription)
+                log.info("")
         
-        self.all_scores.append(scores)
-        self.interview_data.append({
-            "question": question,
-            "transcription": transcription,
-            "scores": scores
-        })
-        
-        try:
-            os.remove(audio_file)
-        except:
-            pass
+        future = self.executor.submit(self.evaluator.evaluate_response, question, transcription)
+        self.pending_evaluations.append((question_num, question, transcription, future))
         
         return True
     
+    def collect_scores(self):
+        """Wait for background evaluations and record their scores in question order."""
+        for question_num, question, transcription, future in self.pending_evaluations:
+            scores = future.result()
+            
+            log.info(f"SCORES (QUESTION {question_num}):")
+            for category, score in scores.items():
+                log.info(f"- {category}: {score}/5")
+            log.info("")
+            
+            self.all_scores.append(scores)
+            self.interview_data.append(InterviewRecord(
+                question=question,
+                scores=scores,
+                transcription=transcription
+            ))
+        
+        self.pending_evaluations = []
+    
     def ask_coding_question(self, question_num: int, question: str) -> bool:
         """
-        Ask a coding question and evaluate the submitted code.
+        Ask a coding question and queue the submitted code for evaluation.
         
         Args:
             question_num: Question number (1-indexed)
@@ -245,10 +363,10 @@ class InterviewAgent:
         Returns:
             True if question processed successfully, False otherwise
         """
-        print("-" * 40)
-        print(f"CODING PROBLEM {question_num}:")
-        print(question)
-        print()
+        log.info("-" * 40)
+        log.info(f"CODING PROBLEM {question_num}:")
+        log.info(question)
+        log.info("")
         
         code_file = f"solution_{question_num}.txt"
         
@@ -256,58 +374,73 @@ class InterviewAgent:
             f.write(f"# Problem {question_num}: {question}\n")
             f.write("# Write your code below:\n\n")
         
-        print(f"A text file '{code_file}' has been created.")
-        print("Write your code solution in this file.")
-        print()
+        log.info(f"A text file '{code_file}' has been created.")
+        log.info("Write your code solution in this file.")
+        log.info("")
         
+        editor = None
         if os.name == 'nt':
-            os.system(f'notepad {code_file}')
+            editor = subprocess.Popen(['notepad.exe', code_file])
         else:
-            print(f"Please edit {code_file} in your preferred text editor.")
+            log.info(f"Please edit {code_file} in your preferred text editor.")
         
-        input("Press Enter when you've finished writing your code...")
-        print()
+        self.executor.submit(self.code_evaluator.warm_up)
         
-        if not os.path.exists(code_file):
-            print("Code file not found.", flush=True)
+        if editor is not None:
+            editor.wait()
+        
+        self._prompt("Press Enter when you've finished writing your code...")
+        log.info("")
+        
+        try:
+            with open(code_file, 'r') as f:
+                code = f.read()
+        except FileNotFoundError:
+            log.error("Code file not found.")
             return False
         
-        with open(code_file, 'r') as f:
-            code = f.read()
-        
-        print("CODE SUBMITTED:")
-        print(code)
-        print()
-        
-        print("Evaluating your code...", flush=True)
-        evaluation = self.code_evaluator.evaluate_code(question, code)
-        
-        print("EVALUATION:")
-        print(f"- Correctness: {evaluation['correctness']}/5")
-        print(f"- Code Quality: {evaluation['code_quality']}/5")
-        print(f"- Efficiency: {evaluation['efficiency']}/5")
-        print(f"- Overall Score: {evaluation['overall_score']}/5")
-        print()
-        print(f"FEEDBACK: {evaluation['feedback']}")
-        print()
-        
-        scores = {
-            "Correctness": evaluation['correctness'],
-            "Code Quality": evaluation['code_quality'],
-            "Efficiency": evaluation['efficiency'],
-            "Overall": evaluation['overall_score']
-        }
-        
-        self.all_scores.append(scores)
-        self.interview_data.append({
-            "question": question,
-            "code": code,
-            "scores": scores,
-            "feedback": evaluation['feedback']
-        })
+        log.info("CODE SUBMITTED:")
+        log.info(code)
+        log.info("")
+        
+        future = self.executor.submit(self.code_evaluator.evaluate_code, question, code)
+        self.pending_code_evaluations.append((question_num, question, code, future))
+        log.info("Evaluation queued.")
+        log.info("")
         
         return True
     
+    def collect_code_evaluations(self):
+        """Wait for background code evaluations and record their scores in problem order."""
+        for question_num, question, code, future in self.pending_code_evaluations:
+            evaluation = future.result()
+            
+            log.info(f"EVALUATION (PROBLEM {question_num}):")
+            log.info(f"- Correctness: {evaluation['correctness']}/5")
+            log.info(f"- Code Quality: {evaluation['code_quality']}/5")
+            log.info(f"- Efficiency: {evaluation['efficiency']}/5")
+            log.info(f"- Overall Score: {evaluation['overall_score']}/5")
+            log.info("")
+            log.info(f"FEEDBACK: {evaluation['feedback']}")
+            log.info("")
+            
+            scores = {
+                "Correctness": evaluation['correctness'],
+                "Code Quality": evaluation['code_quality'],
+                "Efficiency": evaluation['efficiency'],
+                "Overall": evaluation['overall_score']
+            }
+            
+            self.all_scores.append(scores)
+            self.interview_data.append(InterviewRecord(
+                question=question,
+                scores=scores,
+                code=code,
+                feedback=evaluation['feedback']
+            ))
+        
+        self.pending_code_evaluations = []
+    
     def conduct_interview(self) -> bool:
         """
         Conduct the full interview with all questions.
@@ -316,64 +449,83 @@ class InterviewAgent:
             True if interview completed successfully, False otherwise
         """
         if self.selected_role == "Coding Test":
-            print("The coding test will consist of 3 problems.")
-            print("For each problem, a text file will open for you to write your solution.")
-            print()
+            log.info("The coding test will consist of 3 problems.")
+            log.info("For each problem, a text file will open for you to write your solution.")
+            log.info("")
             
             for i, question in enumerate(self.questions, start=1):
                 if not self.ask_coding_question(i, question):
-                    print(f"Error processing problem {i}. Aborting test.", flush=True)
+                    log.error(f"Error processing problem {i}. Aborting test.")
                     return False
+            
+            log.info("Evaluating your code...")
+            log.info("")
+            self.collect_code_evaluations()
         else:
-            print("The interview will consist of 3 questions.")
-            print("After each question, you will have up to 60 seconds to respond.")
-            print("Recording will automatically stop after 2 seconds of silence.")
-            print()
+            log.info("The interview will consist of 3 questions.")
+            log.info("After each question, you will have up to 60 seconds to respond.")
+            log.info("Recording will automatically stop after 2 seconds of silence.")
+            log.info("")
             
             for i, question in enumerate(self.questions, start=1):
+                if i < len(self.questions):
+                    self.tts.prefetch(self.questions[i])
+                
                 if not self.ask_question(i, question):
-                    print(f"Error processing question {i}. Aborting interview.", flush=True)
+                    log.error(f"Error processing question {i}. Aborting interview.")
                     return False
+            
+            log.info("Scoring answers...")
+            log.info("")
+            self.collect_scores()
         
         return True
     
     def print_final_summary(self):
         """Print the final interview summary with recommendations."""
-        print("-" * 40)
-        print("FINAL SUMMARY")
-        print("-" * 40)
-        print()
+        log.info("-" * 40)
+        log.info("FINAL SUMMARY")
+        log.info("-" * 40)
+        log.info("")
         
         average_scores = self.evaluator.calculate_final_scores(self.all_scores)
         
-        print("AVERAGE SCORES:")
+        log.info("AVERAGE SCORES:")
         for category, avg_score in average_scores.items():
-            print(f"- {category}: {avg_score}/5")
-        print()
+            log.info(f"- {category}: {avg_score}/5")
+        log.info("")
         
         recommendation = self.evaluator.get_recommendation(average_scores)
-        print(f"OVERALL RECOMMENDATION: {recommendation}")
-        print()
+        log.info(f"OVERALL RECOMMENDATION: {recommendation}")
+        log.info("")
         
-        print("=" * 50)
-        print("INTERVIEW COMPLETE")
-        print("=" * 50)
+        log.info("=" * 50)
+        log.info("INTERVIEW COMPLETE")
+        log.info("=" * 50)
     
     def run(self):
         """Main entry point to run the interview agent."""
-        if not self.select_role():
-            print("Role selection failed. Exiting.", flush=True)
-            sys.exit(1)
-        
-        if not self.setup():
-            print("Setup failed. Exiting.", flush=True)
-            sys.exit(1)
-        
-        if not self.conduct_interview():
-            print("Interview incomplete.", flush=True)
-            sys.exit(1)
-        
-        self.print_final_summary()
+        self.log_listener = start_console_log()
+        try:
+            if not self.select_role():
+                log.error("Role selection failed. Exiting.")
+                sys.exit(1)
+            
+            if not self.setup():
+                log.error("Setup failed. Exiting.")
+                sys.exit(1)
+            
+            if not self.conduct_interview():
+                log.error("Interview incomplete.")
+                sys.exit(1)
+            
+            self.print_final_summary()
+        finally:
+            self.executor.shutdown(cancel_futures=True)
+            close_clients()
+            self.tts.close()
+            stop_console_log(self.log_listener)
+            self.log_listener = None
 
 
 if __name__ == "__main__":
@@ -0,0 +1,164 @@
+import json
+import logging
+import os
+import threading
+from typing import Dict, Optional
+
+import numpy as np
+
+
+log = logging.getLogger("interview_agent.semantic_cache")
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".ai_interview_semcache")
+DEFAULT_MODEL = "BAAI/bge-small-en-v1.5"
+
+
+class SemanticCache:
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, threshold: float = 0.92,
+                 model_name: str = DEFAULT_MODEL, enabled: Optional[bool] = None):
+        """
+        Initialize an embedding-similarity cache for response scores.
+
+        Paraphrased answers to the same question reuse the scores of an
+        earlier answer whose embedding is close enough, skipping the LLM call.
+
+        Args:
+            cache_dir: Directory where vectors and scores are persisted
+            threshold: Minimum cosine similarity for a cache hit
+            model_name: fastembed model used for embeddings
+            enabled: Whether to use the cache. Defaults to the SEMANTIC_CACHE
+                     environment variable ("on", "true" or "1"), else off.
+        """
+        if enabled is None:
+            enabled = os.getenv("SEMANTIC_CACHE", "").strip().lower() in ("1", "true", "on")
+
+        self.enabled = enabled
+        self.threshold = threshold
+        self.model_name = model_name
+        self.cache_dir = os.path.join(cache_dir, model_name.replace("/", "__"))
+
+        self._model = None
+        self._vectors = None
+        self._entries = []
+        self._lock = threading.Lock()
+
+    def _load(self) -> bool:
+        """
+        Load the embedding model and persisted entries on first use.
+
+        Returns:
+            True if the cache is usable, False if it is disabled or unavailable
+        """
+        if not self.enabled:
+            return False
+        if self._model is not None:
+            return True
+
+        try:
+            from fastembed import TextEmbedding
+            self._model = TextEmbedding(model_name=self.model_name)
+        except Exception as e:
+            log.warning(f"Warning: Semantic cache disabled: {e}")
+            self.enabled = False
+            return False
+
+        vectors_file = os.path.join(self.cache_dir, "vectors.npy")
+        entries_file = os.path.join(self.cache_dir, "entries.json")
+        try:
+            vectors = np.load(vectors_file)
+            with open(entries_file, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            valid = isinstance(entries, list) and all(
+                isinstance(entry, dict) and isinstance(entry.get("question"), str)
+                and isinstance(entry.get("scores"), dict)
+                for entry in entries
+            )
+            if valid and vectors.ndim == 2 and len(vectors) == len(entries):
+                self._vectors = vectors.astype(np.float32, copy=False)
+                self._entries = entries
+            else:
+                log.warning("Warning: Ignoring malformed semantic cache")
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            log.warning(f"Warning: Could not load semantic cache: {e}")
+
+        return True
+
+    def embed(self, transcription: str) -> Optional[np.ndarray]:
+        """
+        Embed a candidate answer.
+
+        Args:
+            transcription: The candidate's answer
+
+        Returns:
+            Unit-length float32 vector, or None if the cache is disabled
+        """
+        with self._lock:
+            ready = self._load()
+        if not ready:
+            return None
+
+        vector = np.asarray(next(iter(self._model.embed([transcription]))), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def lookup(self, vector: np.ndarray, question: str) -> Optional[Dict[str, int]]:
+        """
+        Find scores of the most similar cached answer to the same question.
+
+        Args:
+            vector: Embedding from embed()
+            question: The interview question
+
+        Returns:
+            Cached scores if the best match clears the threshold, else None
+        """
+        with self._lock:
+            if self._vectors is None or self._vectors.shape[1] != vector.shape[0]:
+                return None
+
+            same_question = np.fromiter(
+                (entry["question"] == question for entry in self._entries),
+                dtype=bool, count=len(self._entries)
+            )
+            if not same_question.any():
+                return None
+
+            similarities = self._vectors @ vector
+            similarities[~same_question] = -np.inf
+            best = int(np.argmax(similarities))
+            if similarities[best] > self.threshold:
+                return dict(self._entries[best]["scores"])
+        return None
+
+    def store(self, vector: np.ndarray, question: str, scores: Dict[str, int]):
+        """
+        Add scores for an embedded answer and persist the cache.
+
+        Args:
+            vector: Embedding from embed()
+            question: The interview question
+            scores: Scores assigned to the answer
+        """
+        with self._lock:
+            if self._vectors is None or self._vectors.shape[1] != vector.shape[0]:
+                self._vectors = np.empty((0, vector.shape[0]), dtype=np.float32)
+                self._entries = []
+
+            self._vectors = np.vstack([self._vectors, vector[np.newaxis, :]])
+            self._entries.append({"question": question, "scores": scores})
+
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                vectors_tmp = os.path.join(self.cache_dir, "vectors.tmp.npy")
+                entries_tmp = os.path.join(self.cache_dir, "entries.json.tmp")
+                np.save(vectors_tmp, self._vectors)
+                with open(entries_tmp, 'w', encoding='utf-8') as f:
+                    json.dump(self._entries, f)
+                os.replace(vectors_tmp, os.path.join(self.cache_dir, "vectors.npy"))
+                os.replace(entries_tmp, os.path.join(self.cache_dir, "entries.json"))
+            except OSError as e:
+                log.warning(f"Warning: Could not save semantic cache: {e}")
@@ -1,20 +1,36 @@
+import logging
 import os
+import struct
+import subprocess
+import uuid
 from openai import OpenAI
-from typing import Optional
+from typing import Iterable, Iterator, Optional, Union
+
+import numpy as np
+
+from llm_client import get_groq_client
+
+
+log = logging.getLogger("interview_agent.transcriber")
 
 
 class SpeechTranscriber:
-    def __init__(self, api_key: str, model_name: str = "whisper-large-v3-turbo"):
+    def __init__(self, api_key: str, model_name: str = "whisper-large-v3-turbo",
+                 compress_audio: bool = False, client: Optional[OpenAI] = None):
         """
         Initialize Whisper transcriber using Groq API via OpenAI client.
         
         Args:
             api_key: Groq API key
             model_name: Whisper model to use (whisper-large-v3-turbo for production)
+            compress_audio: Transcode in-memory recordings to Opus with ffmpeg
+                            before upload (roughly 10x fewer bytes on the wire)
+            client: OpenAI client to use. Defaults to the shared Groq client.
         """
         self.api_key = api_key
         self.model_name = model_name
-        self.client = None
+        self.compress_audio = compress_audio
+        self.client = client
         
     def load_model(self) -> bool:
         """
@@ -24,26 +40,24 @@ class SpeechTranscriber:
             True if client initialized successfully, False otherwise
         """
         if not self.api_key or self.api_key == "your_groq_api_key_here":
-            print("ERROR: GROQ_API_KEY not configured in .env file", flush=True)
+            log.error("ERROR: GROQ_API_KEY not configured in .env file")
             return False
         
         try:
-            self.client = OpenAI(
-                api_key=self.api_key,
-                base_url="https://api.groq.com/openai/v1"
-            )
-            print("Groq API configured.", flush=True)
+            if self.client is None:
+                self.client = get_groq_client(self.api_key)
+            log.info("Groq API configured.")
             return True
         except Exception as e:
-            print(f"Error initializing Groq client: {e}", flush=True)
+            log.error(f"Error initializing Groq client: {e}")
             return False
     
-    def transcribe(self, audio_file: str) -> Optional[str]:
+    def transcribe(self, audio: Union[str, bytes]) -> Optional[str]:
         """
-        Transcribe audio file to text using Groq Whisper API.
+        Transcribe audio to text using Groq Whisper API.
         
         Args:
-            audio_file: Path to the WAV audio file
+            audio: Path to a WAV file, or the WAV file contents as bytes
             
         Returns:
             Transcribed text or None if transcription fails
@@ -52,20 +66,180 @@ class SpeechTranscriber:
             if not self.load_model():
                 return None
         
-        if not os.path.exists(audio_file):
-            print(f"Audio file not found: {audio_file}", flush=True)
+        if isinstance(audio, bytes):
+            if self.compress_audio:
+                encoded = self._encode_opus(audio)
+                if encoded is not None:
+                    return self._transcribe_file(("audio.ogg", encoded, "audio/ogg"))
+            return self._transcribe_file(("audio.wav", audio, "audio/wav"))
+        
+        try:
+            with open(audio, 'rb') as audio_file:
+                return self._transcribe_file((os.path.basename(audio), audio_file, "audio/wav"))
+        except FileNotFoundError:
+            log.error(f"Audio file not found: {audio}")
+            return None
+        except OSError as e:
+            log.error(f"Error reading audio file: {e}")
+            return None
+    
+    def transcribe_stream(self, frames: Iterable[np.ndarray], sample_rate: int,
+                          channels: int = 1) -> Optional[str]:
+        """
+        Transcribe audio while it is still being recorded.
+        
+        PCM chunks are uploaded as they arrive behind a WAV header of
+        unknown length, so only the tail of the answer is sent after
+        recording stops. frames is always consumed to the end, so the
+        recording completes even when the upload fails.
+        
+        Args:
+            frames: Iterable of int16 PCM chunks, e.g. AudioRecorder.stream_frames()
+            sample_rate: Sample rate of the audio in Hz
+            channels: Number of interleaved channels
+            
+        Returns:
+            Transcribed text or None if nothing was recorded or transcription fails
+        """
+        frames = iter(frames)
+        try:
+            return self._upload_stream(frames, sample_rate, channels)
+        finally:
+            # Let the recording run to the end even if the upload failed early,
+            # so the caller can fall back to sending the complete recording
+            try:
+                for _ in frames:
+                    pass
+            except Exception as e:
+                log.error(f"Error recording audio: {e}")
+    
+    def _upload_stream(self, frames: Iterator[np.ndarray], sample_rate: int,
+                       channels: int) -> Optional[str]:
+        """
+        Post PCM chunks to the transcription endpoint as they arrive.
+        
+        The request goes through self.client's base URL, credentials and
+        connection pool, so an injected client is honoured here as well.
+        
+        Args:
+            frames: Iterator of int16 PCM chunks
+            sample_rate: Sample rate of the audio in Hz
+            channels: Number of interleaved channels
+            
+        Returns:
+            Transcribed text or None if nothing was recorded or transcription fails
+        """
+        if self.client is None:
+            if not self.load_model():
+                return None
+        
+        try:
+            first = next(frames, None)
+        except Exception as e:
+            log.error(f"Error recording audio: {e}")
+            return None
+        if first is None:
             return None
         
+        boundary = uuid.uuid4().hex
         try:
-            with open(audio_file, 'rb') as audio:
-                transcript = self.client.audio.transcriptions.create(
-                    file=audio,
-                    model=self.model_name
-                )
-                
-                transcription = transcript.text.strip()
-                return transcription
+            # The SDK cannot send a body of unknown length, so post through
+            # the client's underlying httpx connection pool directly
+            response = self.client._client.post(
+                str(self.client.base_url.join("audio/transcriptions")),
+                headers={
+                    **self.client.auth_headers,
+                    "Content-Type": f"multipart/form-data; boundary={boundary}"
+                },
+                content=self._multipart_stream(boundary, first, frames, sample_rate, channels)
+            )
+            response.raise_for_status()
+            return response.json()["text"].strip()
+            
+        except Exception as e:
+            log.error(f"Error during streaming transcription: {e}")
+            return None
+    
+    def _multipart_stream(self, boundary: str, first: np.ndarray, frames: Iterator[np.ndarray],
+                          sample_rate: int, channels: int) -> Iterator[bytes]:
+        """
+        Generate a multipart/form-data transcription request body chunk by chunk.
+        
+        Args:
+            boundary: Multipart boundary string
+            first: First PCM chunk, already taken from frames
+            frames: Remaining PCM chunks
+            sample_rate: Sample rate of the audio in Hz
+            channels: Number of interleaved channels
+            
+        Yields:
+            Encoded pieces of the request body
+        """
+        yield (
+            f"--{boundary}\r\n"
+            f"Content-Disposition: form-data; name=\"model\"\r\n\r\n"
+            f"{self.model_name}\r\n"
+            f"--{boundary}\r\n"
+            f"Content-Disposition: form-data; name=\"file\"; filename=\"audio.wav\"\r\n"
+            f"Content-Type: audio/wav\r\n\r\n"
+        ).encode("ascii")
+        
+        # 0xFFFFFFFF sizes mark a WAV of unknown length, read until end of data
+        yield struct.pack(
+            "<4sI4s4sIHHIIHH4sI",
+            b"RIFF", 0xFFFFFFFF, b"WAVE",
+            b"fmt ", 16, 1, channels, sample_rate, sample_rate * channels * 2, channels * 2, 16,
+            b"data", 0xFFFFFFFF
+        )
+        
+        yield first.tobytes()
+        for chunk in frames:
+            yield chunk.tobytes()
+        
+        yield f"\r\n--{boundary}--\r\n".encode("ascii")
+    
+    def _encode_opus(self, wav: bytes) -> Optional[bytes]:
+        """
+        Transcode WAV audio to Ogg Opus with ffmpeg.
+        
+        Args:
+            wav: WAV file contents
+            
+        Returns:
+            Ogg Opus bytes, or None if ffmpeg is unavailable or fails
+        """
+        try:
+            result = subprocess.run(
+                ["ffmpeg", "-loglevel", "error", "-f", "wav", "-i", "pipe:0",
+                 "-c:a", "libopus", "-b:a", "24k", "-f", "ogg", "pipe:1"],
+                input=wav,
+                capture_output=True,
+                check=True
+            )
+            return result.stdout
+        except (OSError, subprocess.CalledProcessError) as e:
+            log.warning(f"Warning: Opus encoding failed, uploading WAV: {e}")
+            return None
+    
+    def _transcribe_file(self, file) -> Optional[str]:
+        """
+        Send audio to the Groq transcription endpoint.
+        
+        Args:
+            file: Open file object or (filename, content, content_type) tuple
+            
+        Returns:
+            Transcribed text or None if transcription fails
+        """
+        try:
+            transcript = self.client.audio.transcriptions.create(
+                file=file,
+                model=self.model_name
+            )
+            
+            transcription = transcript.text.strip()
+            return transcription
             
         except Exception as e:
-            print(f"Error during transcription: {e}", flush=True)
+            log.error(f"Error during transcription: {e}")
             return None
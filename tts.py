@@ -1,39 +1,193 @@
+import logging
 import edge_tts
 import asyncio
-import os
-from typing import Optional
+import threading
+from concurrent.futures import Future
+from typing import Dict, Optional
 import sounddevice as sd
-from scipy.io.wavfile import read as wav_read
+
+from audio import PORTAUDIO_LOCK
+
+
+log = logging.getLogger("interview_agent.tts")
 
 
 class TextToSpeech:
-    def __init__(self, voice: str = "en-US-GuyNeural"):
+    def __init__(self, voice: str = "en-US-GuyNeural", sample_rate: int = 24000):
         """
         Initialize Edge TTS for text-to-speech.
         
         Args:
             voice: Voice to use for speech synthesis
+            sample_rate: Playback sample rate in Hz (Edge TTS produces 24 kHz audio)
         """
         self.voice = voice
+        self.sample_rate = sample_rate
+        self._prefetched: Dict[str, Future] = {}
         
-    async def _generate_speech(self, text: str, output_file: str) -> bool:
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._loop_thread.start()
+    
+    async def _stream_speech(self, text: str) -> bool:
         """
-        Generate speech from text using Edge TTS.
+        Synthesize speech with Edge TTS and play it while it is being generated.
+        
+        MP3 chunks from Edge TTS are piped through an ffmpeg decoder whose PCM
+        output is written straight to the speakers.
         
         Args:
             text: Text to convert to speech
-            output_file: Path to save the audio file
-            
+        
         Returns:
             True if successful, False otherwise
         """
+        decoder = None
+        tasks = []
         try:
-            communicate = edge_tts.Communicate(text, self.voice)
-            await communicate.save(output_file)
+            audio = await self._take_prefetched(text)
+            decoder = await asyncio.create_subprocess_exec(
+                "ffmpeg", "-loglevel", "error", "-i", "pipe:0",
+                "-f", "s16le", "-ar", str(self.sample_rate), "-ac", "1", "pipe:1",
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+            
+            tasks = [
+                asyncio.create_task(self._feed_decoder(text, audio, decoder)),
+                asyncio.create_task(self._play_decoded(decoder))
+            ]
+            await asyncio.gather(*tasks)
+            await decoder.wait()
             return True
+        
         except Exception as e:
-            print(f"Error generating speech: {e}", flush=True)
+            log.error(f"Error streaming speech: {e}")
             return False
+        
+        finally:
+            # gather() leaves the other task running when one fails, so stop
+            # it here rather than letting it outlive the decoder
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if decoder is not None and decoder.returncode is None:
+                decoder.kill()
+                await decoder.wait()
+    
+    async def _feed_decoder(self, text: str, audio: Optional[bytes], decoder: asyncio.subprocess.Process):
+        """
+        Write MP3 audio into the decoder, streaming from Edge TTS unless prefetched.
+        
+        Args:
+            text: Text being spoken
+            audio: Prefetched MP3 audio, or None to synthesize it now
+            decoder: Running ffmpeg process
+        """
+        try:
+            if audio is not None:
+                decoder.stdin.write(audio)
+                await decoder.stdin.drain()
+            else:
+                communicate = edge_tts.Communicate(text, self.voice)
+                async for chunk in communicate.stream():
+                    if chunk["type"] == "audio":
+                        decoder.stdin.write(chunk["data"])
+                        await decoder.stdin.drain()
+        finally:
+            decoder.stdin.close()
+    
+    async def _synthesize(self, text: str) -> Optional[bytes]:
+        """
+        Synthesize the complete MP3 audio for text without playing it.
+        
+        Args:
+            text: Text to convert to speech
+        
+        Returns:
+            MP3 audio bytes, or None if synthesis failed
+        """
+        try:
+            communicate = edge_tts.Communicate(text, self.voice)
+            chunks = []
+            async for chunk in communicate.stream():
+                if chunk["type"] == "audio":
+                    chunks.append(chunk["data"])
+            return b"".join(chunks)
+        except Exception as e:
+            log.error(f"Error prefetching speech: {e}")
+            return None
+    
+    async def _take_prefetched(self, text: str) -> Optional[bytes]:
+        """
+        Claim finished prefetched audio for text.
+        
+        A prefetch that is still running is cancelled, since streaming live
+        starts playback sooner than waiting for the whole file.
+        
+        Args:
+            text: Text about to be spoken
+        
+        Returns:
+            MP3 audio bytes, or None if nothing usable was prefetched
+        """
+        prefetched = self._prefetched.pop(text, None)
+        if prefetched is None:
+            return None
+        if not prefetched.done():
+            prefetched.cancel()
+            return None
+        return await asyncio.wrap_future(prefetched)
+    
+    def prefetch(self, text: str):
+        """
+        Synthesize speech for text in the background so a later speak() can
+        play it without waiting on Edge TTS.
+        
+        Args:
+            text: Text that will be spoken later
+        """
+        if text not in self._prefetched:
+            self._prefetched[text] = asyncio.run_coroutine_threadsafe(self._synthesize(text), self._loop)
+    
+    def _open_output_stream(self) -> sd.RawOutputStream:
+        """Open (but do not start) a 16-bit mono speaker output stream."""
+        with PORTAUDIO_LOCK:
+            return sd.RawOutputStream(samplerate=self.sample_rate, channels=1, dtype='int16')
+    
+    async def _play_decoded(self, decoder: asyncio.subprocess.Process):
+        """
+        Play 16-bit mono PCM from the decoder until it finishes.
+        
+        Args:
+            decoder: Running ffmpeg process
+        """
+        output = await asyncio.to_thread(self._open_output_stream)
+        with output as stream:
+            pending = b""
+            while True:
+                data = await decoder.stdout.read(8192)
+                if not data:
+                    break
+                
+                data = pending + data
+                usable = len(data) - len(data) % 2
+                pending = data[usable:]
+                if usable:
+                    await asyncio.to_thread(stream.write, data[:usable])
+    
+    def speak_async(self, text: str) -> Future:
+        """
+        Start speaking text on the background event loop.
+        
+        Args:
+            text: Text to speak
+        
+        Returns:
+            Future resolving to True once playback finishes, False on failure
+        """
+        return asyncio.run_coroutine_threadsafe(self._stream_speech(text), self._loop)
     
     def speak(self, text: str) -> bool:
         """
@@ -41,48 +195,41 @@ class TextToSpeech:
         
         Args:
             text: Text to speak
-            
+        
         Returns:
             True if successful, False otherwise
         """
-        temp_audio_file = "temp_tts.mp3"
-        
-        try:
-            asyncio.run(self._generate_speech(text, temp_audio_file))
-            
-            if not os.path.exists(temp_audio_file):
-                return False
-            
-            self._play_audio(temp_audio_file)
-            
-            try:
-                os.remove(temp_audio_file)
-            except:
-                pass
-            
-            return True
-            
-        except Exception as e:
-            print(f"Error playing speech: {e}", flush=True)
-            return False
+        return self.play(self.speak_async(text))
+    
+    async def _cancel_tasks(self):
+        """Cancel outstanding prefetch and playback tasks and wait for them to unwind."""
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self._loop.shutdown_asyncgens()
+    
+    def close(self):
+        """Stop the background event loop once no more speech will be played."""
+        self._prefetched.clear()
+        if self._loop.is_running():
+            asyncio.run_coroutine_threadsafe(self._cancel_tasks(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join()
+        self._loop.close()
     
-    def _play_audio(self, audio_file: str):
+    def play(self, speech: Future) -> bool:
         """
-        Play audio file through speakers.
+        Wait for speech started with speak_async to finish playing.
         
         Args:
-            audio_file: Path to audio file
+            speech: Future returned by speak_async
+        
+        Returns:
+            True if successful, False otherwise
         """
         try:
-            import subprocess
-            
-            if os.name == 'nt':
-                os.startfile(audio_file)
-                import time
-                time.sleep(3)
-            else:
-                subprocess.run(['ffplay', '-nodisp', '-autoexit', audio_file], 
-                             stdout=subprocess.DEVNULL, 
-                             stderr=subprocess.DEVNULL)
+            return speech.result()
         except Exception as e:
-            print(f"Could not play audio: {e}", flush=True)
+            log.error(f"Error playing speech: {e}")
+            return False